@@ -16,6 +16,8 @@ import base64
 import hashlib
 import os
 import platform
+import functools
+import urllib.parse
 
 # List of public WebSocket endpoints to test
 ENDPOINTS = [
@@ -26,19 +28,24 @@ ENDPOINTS = [
     "wss://api.enterprise.uneeq.io/signalling-service/v2/ws/renderer"
 ]
 
-def get_timeout_command():
+# Maximum number of endpoints tested at the same time
+MAX_CONCURRENT_ENDPOINTS = 8
+
+# Platform and PATH lookups are resolved once at import time
+_SYSTEM = platform.system()
+_IS_DARWIN = _SYSTEM == "Darwin"
+
+def _detect_timeout_cmd():
     """
-    Get the appropriate timeout command for the current OS
+    Detect the appropriate timeout command for the current OS
     
     Returns:
         str: timeout command ('timeout' on Linux, 'gtimeout' on macOS if available, None if not available)
     """
-    system = platform.system()
-    
-    if system == "Linux":
+    if _SYSTEM == "Linux":
         if shutil.which("timeout"):
             return "timeout"
-    elif system == "Darwin":  # macOS
+    elif _IS_DARWIN:  # macOS
         # Try gtimeout first (from coreutils)
         if shutil.which("gtimeout"):
             return "gtimeout"
@@ -47,57 +54,301 @@ def get_timeout_command():
     
     return None
 
-def run_with_timeout(cmd_list, timeout_seconds, **kwargs):
+_TIMEOUT_CMD = _detect_timeout_cmd()
+_BIN_PRESENT = {binary: shutil.which(binary) is not None for binary in ("wscat", "websocat", "socat")}
+
+# External tests in display order, with the binary each one needs
+_TOOL_BINARIES = (
+    ("wscat", "wscat"),
+    ("websocat", "websocat"),
+    ("socat-http", "socat"),
+    ("socat-websocket", "socat")
+)
+_AVAILABLE_TOOLS = tuple(tool_name for tool_name, binary_name in _TOOL_BINARIES if _BIN_PRESENT[binary_name])
+
+# Permissive SSL context shared by all Python websockets connections, built once
+# so the CA bundle and OpenSSL state are not set up again for every endpoint
+_SSL_CTX = ssl.create_default_context()
+_SSL_CTX.check_hostname = False
+_SSL_CTX.verify_mode = ssl.CERT_NONE
+
+# Verifying context for the strict certificate probe in diagnose_socat_failure
+_STRICT_SSL_CTX = ssl.create_default_context()
+
+def get_timeout_command():
+    """
+    Get the appropriate timeout command for the current OS
+    
+    Returns:
+        str: timeout command ('timeout' on Linux, 'gtimeout' on macOS if available, None if not available)
+    """
+    return _TIMEOUT_CMD
+
+@functools.lru_cache(maxsize=None)
+def _parse_ws_uri(uri):
+    """
+    Split a WebSocket URI into the parts needed for raw socket probes
+    
+    Args:
+        uri (str): WebSocket URI to parse
+        
+    Returns:
+        tuple: (hostname: str, port: str, path: str, use_ssl: bool), or None if the scheme is not ws/wss
+    """
+    parts = urllib.parse.urlsplit(uri)
+    if parts.scheme not in ("ws", "wss"):
+        return None
+    
+    use_ssl = parts.scheme == "wss"
+    port = str(parts.port or (443 if use_ssl else 80))
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    
+    return parts.hostname, port, path, use_ssl
+
+# Hostname -> IPv4 address, filled by resolve() so probes skip repeated lookups
+_DNS_CACHE = {}
+
+async def resolve(host):
+    """
+    Resolve a hostname once via the event loop and cache its IPv4 address
+    
+    Args:
+        host (str): Hostname to resolve
+        
+    Returns:
+        str: Cached IPv4 address, or the hostname itself if resolution failed
+    """
+    if host not in _DNS_CACHE:
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, None, family=socket.AF_INET)
+            _DNS_CACHE[host] = infos[0][4][0]
+        except (OSError, UnicodeError):
+            # Leave the failure (including names getaddrinfo cannot encode) for the probes to report
+            return host
+    
+    return _DNS_CACHE[host]
+
+def _socat_ssl_target(address, port, verify=False, commonname=None):
     """
-    Run a command with timeout, handling cross-platform differences
+    Build a socat SSL address, adding the macOS compatibility options where needed
+    
+    Args:
+        address (str): Host or IP address to connect to
+        port (str): Port to connect to
+        verify (bool): Whether socat should verify the server certificate
+        commonname (str): Hostname socat uses for SNI and certificate checks
+        
+    Returns:
+        str: socat address such as 'SSL:1.2.3.4:443,verify=0,commonname=example.com'
+    """
+    parts = [f"SSL:{address}:{port}"]
+    if not verify:
+        parts.append("verify=0")
+    if commonname:
+        parts.append(f"commonname={commonname}")
+    if _IS_DARWIN:
+        parts.append("method=TLS1.2")
+    return ",".join(parts)
+
+# Request templates for the raw HTTP and WebSocket handshake probes, filled with %b
+_HTTP_TEMPLATE = b"GET %b HTTP/1.1\r\nHost: %b\r\nConnection: close\r\nUser-Agent: socat-http-test\r\n\r\n"
+_WS_TEMPLATE = b"GET %b HTTP/1.1\r\nHost: %b\r\nUpgrade: websocket\r\nConnection: Upgrade\r\nSec-WebSocket-Key: %b\r\nSec-WebSocket-Version: 13\r\n\r\n"
+
+@functools.lru_cache(maxsize=None)
+def _http_request(hostname, path):
+    """
+    Build the plain HTTP GET request sent by the HTTP probes, once per host and path
+    
+    Args:
+        hostname (str): Value for the Host header
+        path (str): Request path
+        
+    Returns:
+        bytes: Encoded HTTP request
+    """
+    return _HTTP_TEMPLATE % (path.encode('utf-8'), hostname.encode('utf-8'))
+
+# GUID appended to Sec-WebSocket-Key when computing Sec-WebSocket-Accept (RFC 6455)
+_WS_MAGIC = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+@functools.lru_cache(maxsize=None)
+def _ws_handshake_request(hostname, path):
+    """
+    Build the WebSocket upgrade request sent by the handshake probes, once per host and path
+    
+    Args:
+        hostname (str): Value for the Host header
+        path (str): Request path
+        
+    Returns:
+        tuple: (request: bytes, expected_accept: str) where expected_accept is the
+        Sec-WebSocket-Accept value a compliant server answers with
+    """
+    # Generate WebSocket key
+    key = base64.b64encode(os.urandom(16))
+    request = _WS_TEMPLATE % (path.encode('utf-8'), hostname.encode('utf-8'), key)
+    
+    # Expected response key for validation
+    digest = hashlib.sha1()
+    digest.update(key)
+    digest.update(_WS_MAGIC)
+    expected_key = base64.b64encode(digest.digest()).decode('ascii')
+    
+    return request, expected_key
+
+async def run_with_timeout(cmd_list, timeout_seconds, input=None, text=False, use_timeout_cmd=False):
+    """
+    Run a command asynchronously, killing it if it outlives the timeout
     
     Args:
         cmd_list (list): Command as list of strings
         timeout_seconds (int): Timeout in seconds
-        **kwargs: Additional arguments for subprocess.run
+        input (str or bytes): Data written to the command's stdin (None for no stdin)
+        text (bool): Encode input and decode output as UTF-8
+        use_timeout_cmd (bool): Also wrap the command in the system timeout command, if available
         
     Returns:
-        subprocess.CompletedProcess: Result of subprocess.run
+        subprocess.CompletedProcess: Result of the command; returncode is 124 (as with the
+        timeout command) if the command was killed for running too long
     """
-    timeout_cmd = get_timeout_command()
+    timeout_cmd = get_timeout_command() if use_timeout_cmd else None
     
     if timeout_cmd:
-        # Use system timeout command
+        # Use system timeout command; the asyncio timeout below is only a backstop
         full_cmd = [timeout_cmd, str(timeout_seconds)] + cmd_list
+        deadline = timeout_seconds + 2
     else:
-        # Fall back to subprocess timeout (less reliable for hanging processes)
         full_cmd = cmd_list
-        kwargs['timeout'] = timeout_seconds + 2
+        deadline = timeout_seconds
+    
+    if text and input is not None:
+        input = input.encode('utf-8')
+    
+    proc = await asyncio.create_subprocess_exec(
+        *full_cmd,
+        stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(input), deadline)
+        returncode = proc.returncode
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        stdout, stderr, returncode = b"", b"", 124
+    
+    if text:
+        stdout = stdout.decode('utf-8', errors='replace')
+        stderr = stderr.decode('utf-8', errors='replace')
+    
+    return subprocess.CompletedProcess(full_cmd, returncode, stdout, stderr)
+
+async def _py_probe(host, port, use_ssl=False, verify=False, sni=None, send_bytes=b"", timeout=10, limit=4096):
+    """
+    Probe an endpoint in-process over asyncio streams instead of forking socat
+    
+    Args:
+        host (str): Hostname to connect to (the address cached by resolve() is used if present)
+        port (str): Port to connect to
+        use_ssl (bool): Wrap the connection in TLS
+        verify (bool): Validate the server certificate and hostname
+        sni (str): Server name to send in the TLS handshake (None sends no SNI)
+        send_bytes (bytes): Request to write once connected (empty to only connect)
+        timeout (int): Timeout in seconds for the whole probe
+        limit (int): Maximum number of response bytes to read
+        
+    Returns:
+        tuple: (success: bool, output: bytes, error: str)
+    """
+    ssl_context = None
+    server_hostname = None
+    if use_ssl:
+        ssl_context = _STRICT_SSL_CTX if verify else _SSL_CTX
+        # asyncio treats an empty server_hostname as "send no SNI"
+        server_hostname = sni or ""
+    
+    async def exchange():
+        reader, writer = await asyncio.open_connection(
+            _DNS_CACHE.get(host, host),
+            int(port),
+            ssl=ssl_context,
+            server_hostname=server_hostname
+        )
+        try:
+            response = b""
+            if send_bytes:
+                writer.write(send_bytes)
+                await writer.drain()
+                # Read until the response headers are complete, the server closes, or the limit is hit
+                while len(response) < limit and b"\r\n\r\n" not in response:
+                    chunk = await reader.read(limit - len(response))
+                    if not chunk:
+                        break
+                    response += chunk
+            return response
+        finally:
+            writer.close()
+    
+    try:
+        output = await asyncio.wait_for(exchange(), timeout)
+        return True, output, ""
+    except Exception as e:
+        return False, b"", f"{type(e).__name__}: {str(e)}"
+
+def _ssl_diagnosis(tests):
+    """
+    Work out the SSL diagnosis from whichever SSL probe results are known so far
     
-    return subprocess.run(full_cmd, **kwargs)
+    Args:
+        tests (dict): Test results collected by diagnose_socat_failure
+        
+    Returns:
+        str: SSL diagnosis, "Unknown" if SSL is not the problem, or None if more
+        SSL probe results are needed to decide
+    """
+    strict = tests.get("ssl_strict")
+    if strict is None:
+        return None
+    if strict["success"]:
+        return "Unknown"
+    
+    relaxed = tests.get("ssl_relaxed")
+    if relaxed is None:
+        return None
+    if relaxed["success"]:
+        return "SSL certificate validation issue - server uses invalid/self-signed certificate"
+    
+    sni = tests.get("ssl_sni")
+    if sni is None:
+        return None
+    if sni["success"]:
+        return "SSL Server Name Indication (SNI) required"
+    
+    return "SSL connection issue - cipher suite or protocol version mismatch"
 
-def diagnose_socat_failure(uri, timeout=10):
+async def diagnose_socat_failure(uri, timeout=10, log=print):
     """
     Systematically diagnose why socat failed when Python websockets succeeded
     
+    The probes run in-process through _py_probe, so no socat processes are forked.
+    
     Args:
         uri (str): WebSocket URI to test
         timeout (int): Timeout in seconds
+        log (callable): Receives progress lines (defaults to print)
         
     Returns:
         dict: Detailed diagnostic results
     """
-    if not shutil.which("socat"):
-        return {"available": False, "reason": "socat not installed"}
-    
     # Parse URI
-    if uri.startswith("wss://"):
-        hostname = uri[6:].split('/')[0].split(':')[0]
-        port = uri[6:].split('/')[0].split(':')[1] if ':' in uri[6:].split('/')[0] else "443"
-        path = '/' + '/'.join(uri[6:].split('/')[1:]) if len(uri[6:].split('/')) > 1 else '/'
-        use_ssl = True
-    elif uri.startswith("ws://"):
-        hostname = uri[5:].split('/')[0].split(':')[0]
-        port = uri[5:].split('/')[0].split(':')[1] if ':' in uri[5:].split('/')[0] else "80"
-        path = '/' + '/'.join(uri[5:].split('/')[1:]) if len(uri[5:].split('/')) > 1 else '/'
-        use_ssl = False
-    else:
+    parsed = _parse_ws_uri(uri)
+    if parsed is None:
         return {"available": True, "tests": {}, "diagnosis": "Unsupported URL scheme"}
+    hostname, port, path, use_ssl = parsed
     
     results = {
         "available": True,
@@ -111,147 +362,116 @@ def diagnose_socat_failure(uri, timeout=10):
     
     try:
         # Test 1: Basic TCP connectivity (without SSL)
-        print(f"    → Testing basic TCP connectivity to {hostname}:{port}")
-        result = run_with_timeout(
-            ["socat", "-", f"TCP:{hostname}:{port}"], 
-            timeout,
-            input="", 
-            capture_output=True, 
-            text=True
-        )
+        log(f"    → Testing basic TCP connectivity to {hostname}:{port}")
+        success, output, error = await _py_probe(hostname, port, timeout=timeout)
         results["tests"]["tcp_connect"] = {
-            "success": result.returncode == 0,
-            "output": result.stdout[:200],
-            "error": result.stderr[:200]
+            "success": success,
+            "output": output[:200].decode('utf-8', errors='replace'),
+            "error": error[:200]
         }
         
         if not results["tests"]["tcp_connect"]["success"]:
             results["diagnosis"] = "Network connectivity issue - TCP connection failed"
             return results
         
+        # Tests 2-5 only depend on TCP connectivity, so start them together; probes that
+        # can no longer change the diagnosis are cancelled as soon as it is settled
+        tasks = {}
+        
         if use_ssl:
             # Test 2: SSL connection with strict validation
-            print(f"    → Testing SSL with strict certificate validation")
-            result = run_with_timeout(
-                ["socat", "-", f"SSL:{hostname}:{port}"], 
-                timeout,
-                input="", 
-                capture_output=True, 
-                text=True
+            log(f"    → Testing SSL with strict certificate validation")
+            tasks["ssl_strict"] = asyncio.ensure_future(
+                _py_probe(hostname, port, use_ssl=True, verify=True, sni=hostname, timeout=timeout)
             )
-            results["tests"]["ssl_strict"] = {
-                "success": result.returncode == 0,
-                "output": result.stdout[:200],
-                "error": result.stderr[:200]
-            }
-            
-            # Test 3: SSL connection with relaxed validation and better compatibility
-            print(f"    → Testing SSL with relaxed certificate validation")
-            ssl_options = f"SSL:{hostname}:{port},verify=0"
-            if platform.system() == "Darwin":  # macOS specific SSL options
-                ssl_options += ",method=TLS1.2"
             
-            result = run_with_timeout(
-                ["socat", "-", ssl_options], 
-                timeout,
-                input="", 
-                capture_output=True, 
-                text=True
+            # Test 3: SSL connection with relaxed validation and no SNI
+            log(f"    → Testing SSL with relaxed certificate validation")
+            tasks["ssl_relaxed"] = asyncio.ensure_future(
+                _py_probe(hostname, port, use_ssl=True, timeout=timeout)
             )
-            results["tests"]["ssl_relaxed"] = {
-                "success": result.returncode == 0,
-                "output": result.stdout[:200],
-                "error": result.stderr[:200]
-            }
             
-            # Test 4: SSL with SNI and compatibility options
-            print(f"    → Testing SSL with Server Name Indication (SNI)")
-            ssl_sni_options = f"SSL:{hostname}:{port},verify=0,servername={hostname}"
-            if platform.system() == "Darwin":  # macOS
-                ssl_sni_options += ",method=TLS1.2"
-            
-            result = run_with_timeout(
-                ["socat", "-", ssl_sni_options], 
-                timeout,
-                input="", 
-                capture_output=True, 
-                text=True
+            # Test 4: SSL with relaxed validation and SNI
+            log(f"    → Testing SSL with Server Name Indication (SNI)")
+            tasks["ssl_sni"] = asyncio.ensure_future(
+                _py_probe(hostname, port, use_ssl=True, sni=hostname, timeout=timeout)
             )
-            results["tests"]["ssl_sni"] = {
-                "success": result.returncode == 0,
-                "output": result.stdout[:200],
-                "error": result.stderr[:200]
-            }
-            
-            # Determine SSL diagnosis with macOS-specific handling
-            if not results["tests"]["ssl_strict"]["success"]:
-                if results["tests"]["ssl_relaxed"]["success"]:
-                    results["diagnosis"] = "SSL certificate validation issue - server uses invalid/self-signed certificate"
-                elif results["tests"]["ssl_sni"]["success"]:
-                    results["diagnosis"] = "SSL Server Name Indication (SNI) required"
-                elif platform.system() == "Darwin" and "SSL" in results["tests"]["ssl_strict"]["error"]:
-                    results["diagnosis"] = "macOS socat SSL compatibility issue - try updating socat or use 'brew install coreutils' for gtimeout"
-                else:
-                    results["diagnosis"] = "SSL connection issue - cipher suite or protocol version mismatch"
         
-        # Test 5: HTTP request (non-WebSocket)
-        print(f"    → Testing HTTP request (non-WebSocket)")
-        http_request = f"GET {path} HTTP/1.1\r\nHost: {hostname}\r\nConnection: close\r\n\r\n"
-        
-        if use_ssl:
-            ssl_options = f"SSL:{hostname}:{port},verify=0,servername={hostname}"
-            if platform.system() == "Darwin":
-                ssl_options += ",method=TLS1.2"
-            cmd = ["socat", "-", ssl_options]
-        else:
-            cmd = ["socat", "-", f"TCP:{hostname}:{port}"]
+        # Test 5: WebSocket handshake; any HTTP status line in its reply also shows
+        # that plain HTTP works, so no separate HTTP request is sent
+        log(f"    → Testing WebSocket handshake")
+        ws_request, _ = _ws_handshake_request(hostname, path)
+        tasks["websocket_handshake"] = asyncio.ensure_future(
+            _py_probe(hostname, port, use_ssl=use_ssl, sni=hostname, send_bytes=ws_request, timeout=timeout)
+        )
         
-        result = run_with_timeout(cmd, timeout, input=http_request, capture_output=True, text=True)
+        try:
+            if use_ssl:
+                # Evaluate the SSL decision tree each time an SSL probe finishes
+                ssl_tests = {tasks[name]: name for name in ("ssl_strict", "ssl_relaxed", "ssl_sni")}
+                pending = set(ssl_tests)
+                ssl_diagnosis = None
+                while ssl_diagnosis is None:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        success, output, error = task.result()
+                        results["tests"][ssl_tests[task]] = {
+                            "success": success,
+                            "output": output[:200].decode('utf-8', errors='replace'),
+                            "error": error[:200]
+                        }
+                    ssl_diagnosis = _ssl_diagnosis(results["tests"])
+                
+                # The diagnosis is settled, so drop the SSL probes still in flight
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                
+                results["diagnosis"] = ssl_diagnosis
+                if ssl_diagnosis != "Unknown":
+                    # SSL explains the failure, so the handshake result is not needed
+                    return results
+            
+            success, output, error = await tasks["websocket_handshake"]
+        finally:
+            # Cancel probes that are no longer needed and let them close their connections
+            unfinished = [task for task in tasks.values() if not task.done()]
+            for task in unfinished:
+                task.cancel()
+            await asyncio.gather(*unfinished, return_exceptions=True)
+        
+        # Derive both the HTTP and the WebSocket results from the handshake reply;
+        # only the displayed prefix and the status line are decoded
+        display_output = output[:500].decode('utf-8', errors='replace')
         results["tests"]["http_request"] = {
-            "success": result.returncode == 0 and "HTTP/" in result.stdout,
+            "success": success and b"HTTP/" in output,
             "status_code": None,
-            "output": result.stdout[:500],
-            "error": result.stderr[:200]
+            "output": display_output,
+            "error": error[:200]
         }
         
         # Parse HTTP status code
-        if results["tests"]["http_request"]["success"] and "HTTP/" in result.stdout:
+        if results["tests"]["http_request"]["success"]:
             try:
-                status_line = result.stdout.split('\n')[0]
+                status_line = output.split(b"\n", 1)[0].decode('latin-1')
                 results["tests"]["http_request"]["status_code"] = status_line.split()[1]
             except:
                 pass
         
-        # Test 6: WebSocket handshake
-        print(f"    → Testing WebSocket handshake")
-        key = base64.b64encode(os.urandom(16)).decode('utf-8')
-        ws_request = f"GET {path} HTTP/1.1\r\nHost: {hostname}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
-        
-        if use_ssl:
-            ssl_options = f"SSL:{hostname}:{port},verify=0,servername={hostname}"
-            if platform.system() == "Darwin":
-                ssl_options += ",method=TLS1.2"
-            cmd = ["socat", "-", ssl_options]
-        else:
-            cmd = ["socat", "-", f"TCP:{hostname}:{port}"]
-            
-        result = run_with_timeout(cmd, timeout, input=ws_request, capture_output=True, text=True)
         results["tests"]["websocket_handshake"] = {
-            "success": result.returncode == 0 and "101" in result.stdout,
-            "output": result.stdout[:500],
-            "error": result.stderr[:200]
+            "success": success and b"101" in output,
+            "output": display_output,
+            "error": error[:200]
         }
         
         # Final diagnosis based on all tests
-        if use_ssl and results["diagnosis"] != "Unknown":
-            pass  # SSL diagnosis already set
-        elif results["tests"]["http_request"]["success"]:
+        if results["tests"]["http_request"]["success"]:
             status_code = results["tests"]["http_request"]["status_code"]
             if status_code == "404":
                 results["diagnosis"] = "WebSocket endpoint path not found - server responds to HTTP but WebSocket path doesn't exist"
             elif status_code == "405":
                 results["diagnosis"] = "Server configuration - endpoint exists but doesn't support WebSocket upgrade"
-            elif status_code in ["200", "301", "302"]:
+            elif status_code in ["101", "200", "301", "302"]:
                 if not results["tests"]["websocket_handshake"]["success"]:
                     results["diagnosis"] = "WebSocket protocol compliance - server accepts HTTP but rejects WebSocket handshake headers"
                 else:
@@ -261,14 +481,12 @@ def diagnose_socat_failure(uri, timeout=10):
         else:
             results["diagnosis"] = "HTTP protocol issue - server doesn't respond to HTTP requests properly"
             
-    except subprocess.TimeoutExpired:
-        results["diagnosis"] = "Connection timeout - server too slow to respond"
     except Exception as e:
         results["diagnosis"] = f"Diagnostic error: {str(e)}"
     
     return results
 
-def test_http_with_socat(uri, timeout=10):
+async def test_http_with_socat(uri, timeout=10):
     """
     Test basic HTTP connectivity using socat (before WebSocket upgrade)
     
@@ -277,77 +495,60 @@ def test_http_with_socat(uri, timeout=10):
         timeout (int): Timeout in seconds
         
     Returns:
-        tuple: (success: bool, message: str, tool_available: bool)
+        tuple: (success: bool, message: str)
     """
-    if not shutil.which("socat"):
-        return False, "✗ socat not installed", False
-    
     try:
         # Parse URI to get HTTP equivalent
-        if uri.startswith("wss://"):
-            hostname = uri[6:].split('/')[0].split(':')[0]
-            port = uri[6:].split('/')[0].split(':')[1] if ':' in uri[6:].split('/')[0] else "443"
-            path = '/' + '/'.join(uri[6:].split('/')[1:]) if len(uri[6:].split('/')) > 1 else '/'
-            use_ssl = True
-        elif uri.startswith("ws://"):
-            hostname = uri[5:].split('/')[0].split(':')[0]
-            port = uri[5:].split('/')[0].split(':')[1] if ':' in uri[5:].split('/')[0] else "80"
-            path = '/' + '/'.join(uri[5:].split('/')[1:]) if len(uri[5:].split('/')) > 1 else '/'
-            use_ssl = False
-        else:
-            return False, "✗ Unsupported URL scheme", True
+        parsed = _parse_ws_uri(uri)
+        if parsed is None:
+            return False, "✗ Unsupported URL scheme"
+        hostname, port, path, use_ssl = parsed
+        # Connect to the cached address; commonname keeps SNI and certificate checks on the hostname
+        address = _DNS_CACHE.get(hostname, hostname)
             
-        # Create simple HTTP GET request (not WebSocket upgrade)
-        http_request = f"GET {path} HTTP/1.1\r\nHost: {hostname}\r\nConnection: close\r\nUser-Agent: socat-http-test\r\n\r\n"
+        # Simple HTTP GET request (not WebSocket upgrade)
+        http_request = _http_request(hostname, path)
         
         start_time = time.time()
         
         # Setup socat command with cross-platform SSL options
         if use_ssl:
-            ssl_options = f"SSL:{hostname}:{port}"
-            if platform.system() == "Darwin":  # macOS needs more compatible SSL options
-                ssl_options += ",method=TLS1.2,verify=0"
-            cmd = ["socat", "-", ssl_options]
+            # macOS socat builds need certificate verification disabled
+            cmd = ["socat", "-", _socat_ssl_target(address, port, verify=not _IS_DARWIN, commonname=hostname)]
         else:
-            cmd = ["socat", "-", f"TCP:{hostname}:{port}"]
+            cmd = ["socat", "-", f"TCP:{address}:{port}"]
         
-        result = run_with_timeout(
-            cmd,
-            timeout,
-            input=http_request,
-            capture_output=True,
-            text=True
-        )
+        result = await run_with_timeout(cmd, timeout, input=http_request)
         
         response_time = time.time() - start_time
         
         if result.returncode == 0:
             response = result.stdout
             
-            # Parse HTTP response
-            if "HTTP/1.1" in response or "HTTP/1.0" in response:
-                status_line = response.split('\n')[0].strip()
+            # Parse HTTP response; only the status line is decoded, not the body
+            if b"HTTP/1.1" in response or b"HTTP/1.0" in response:
+                status_line = response.split(b"\n", 1)[0].decode('latin-1').strip()
                 
                 if "200 OK" in status_line:
-                    return True, f"✓ HTTP connection successful: {status_line} ({response_time:.3f}s)", True
+                    return True, f"✓ HTTP connection successful: {status_line} ({response_time:.3f}s)"
                 elif "404" in status_line:
-                    return True, f"✓ HTTP connected but endpoint not found: {status_line} ({response_time:.3f}s)", True
+                    return True, f"✓ HTTP connected but endpoint not found: {status_line} ({response_time:.3f}s)"
                 elif "405 Method Not Allowed" in status_line:
-                    return True, f"✓ HTTP connected, WebSocket-only endpoint: {status_line} ({response_time:.3f}s)", True
+                    return True, f"✓ HTTP connected, WebSocket-only endpoint: {status_line} ({response_time:.3f}s)"
                 else:
-                    return False, f"✗ HTTP error: {status_line} ({response_time:.3f}s)", True
+                    return False, f"✗ HTTP error: {status_line} ({response_time:.3f}s)"
             else:
-                return False, f"✗ No HTTP response received", True
+                return False, f"✗ No HTTP response received"
+        elif result.returncode == 124:  # timeout
+            return False, f"✗ HTTP timeout ({timeout}s)"
         else:
-            error_msg = result.stderr.strip() if result.stderr else "Connection failed"
-            return False, f"✗ HTTP connection failed: {error_msg[:100]}", True
+            error_msg = result.stderr[:200].decode('utf-8', errors='replace').strip() or "Connection failed"
+            return False, f"✗ HTTP connection failed: {error_msg[:100]}"
             
-    except subprocess.TimeoutExpired:
-        return False, f"✗ HTTP timeout ({timeout}s)", True
     except Exception as e:
-        return False, f"✗ HTTP error: {str(e)}", True
+        return False, f"✗ HTTP error: {str(e)}"
 
-def test_websocket_handshake_with_socat(uri, timeout=10):
+async def test_websocket_handshake_with_socat(uri, timeout=10):
     """
     Perform manual WebSocket handshake using socat
     
@@ -356,77 +557,34 @@ def test_websocket_handshake_with_socat(uri, timeout=10):
         timeout (int): Timeout in seconds
         
     Returns:
-        tuple: (success: bool, message: str, tool_available: bool)
+        tuple: (success: bool, message: str)
     """
-    if not shutil.which("socat"):
-        return False, "✗ socat not installed", False
-    
     try:
         # Parse URI
-        if uri.startswith("wss://"):
-            hostname = uri[6:].split('/')[0].split(':')[0]
-            port = uri[6:].split('/')[0].split(':')[1] if ':' in uri[6:].split('/')[0] else "443"
-            path = '/' + '/'.join(uri[6:].split('/')[1:]) if len(uri[6:].split('/')) > 1 else '/'
-            use_ssl = True
-        elif uri.startswith("ws://"):
-            hostname = uri[5:].split('/')[0].split(':')[0]
-            port = uri[5:].split('/')[0].split(':')[1] if ':' in uri[5:].split('/')[0] else "80"
-            path = '/' + '/'.join(uri[5:].split('/')[1:]) if len(uri[5:].split('/')) > 1 else '/'
-            use_ssl = False
-        else:
-            return False, "✗ Unsupported URL scheme", True
+        parsed = _parse_ws_uri(uri)
+        if parsed is None:
+            return False, "✗ Unsupported URL scheme"
+        hostname, port, path, use_ssl = parsed
+        # Connect to the cached address; commonname keeps SNI and certificate checks on the hostname
+        address = _DNS_CACHE.get(hostname, hostname)
             
-        # Create WebSocket handshake request
-        # Generate WebSocket key
-        key = base64.b64encode(os.urandom(16)).decode('utf-8')
-        
-        # Create HTTP request for WebSocket upgrade
-        request = f"GET {path} HTTP/1.1\r\nHost: {hostname}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
-        
-        # Expected response key for validation
-        magic = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
-        expected_key = base64.b64encode(hashlib.sha1((key + magic).encode()).digest()).decode()
+        # WebSocket handshake request and the accept key expected back
+        request, expected_key = _ws_handshake_request(hostname, path)
         
         start_time = time.time()
         
         # Setup socat command with cross-platform SSL options  
         if use_ssl:
-            ssl_options = f"SSL:{hostname}:{port}"
-            if platform.system() == "Darwin":  # macOS compatibility
-                ssl_options += ",method=TLS1.2,verify=0"
-            cmd = ["socat", "-", ssl_options]
+            # macOS socat builds need certificate verification disabled
+            cmd = ["socat", "-", _socat_ssl_target(address, port, verify=not _IS_DARWIN, commonname=hostname)]
         else:
-            cmd = ["socat", "-", f"TCP:{hostname}:{port}"]
+            cmd = ["socat", "-", f"TCP:{address}:{port}"]
         
-        # Run socat with WebSocket handshake (use binary mode to handle WebSocket frames)
-        try:
-            result = run_with_timeout(
-                cmd,
-                timeout,
-                input=request.encode('utf-8'),
-                capture_output=True
-            )
-            
-            # Try to decode response as text, but handle binary WebSocket frames
-            try:
-                response = result.stdout.decode('utf-8', errors='ignore')
-                stderr_text = result.stderr.decode('utf-8', errors='ignore') if result.stderr else ""
-            except:
-                # If decoding fails, work with raw bytes
-                response = str(result.stdout)
-                stderr_text = str(result.stderr) if result.stderr else ""
-                
-        except Exception as decode_error:
-            # Fallback to text mode if binary mode fails
-            result = run_with_timeout(
-                cmd,
-                timeout,
-                input=request,
-                capture_output=True,
-                text=True
-            )
-            response = result.stdout
-            stderr_text = result.stderr
+        # Run socat with WebSocket handshake (binary mode, as WebSocket frames may follow)
+        result = await run_with_timeout(cmd, timeout, input=request)
+        # Decode only the response headers; frames or a body after them are left as bytes
+        response = result.stdout[:4096].partition(b"\r\n\r\n")[0].decode('latin-1')
+        stderr_text = result.stderr[:200].decode('utf-8', errors='ignore')
         
         response_time = time.time() - start_time
         
@@ -434,28 +592,28 @@ def test_websocket_handshake_with_socat(uri, timeout=10):
             # Check for successful WebSocket handshake
             if "HTTP/1.1 101" in response and "Switching Protocols" in response:
                 if f"Sec-WebSocket-Accept: {expected_key}" in response:
-                    return True, f"✓ WebSocket handshake successful with key validation ({response_time:.3f}s)", True
+                    return True, f"✓ WebSocket handshake successful with key validation ({response_time:.3f}s)"
                 else:
-                    return True, f"✓ WebSocket handshake successful but key mismatch ({response_time:.3f}s)", True
+                    return True, f"✓ WebSocket handshake successful but key mismatch ({response_time:.3f}s)"
             elif "HTTP/1.1" in response:
                 status_line = response.split('\n')[0] if '\n' in response else response[:100]
-                return False, f"✗ WebSocket handshake failed: {status_line.strip()}", True
+                return False, f"✗ WebSocket handshake failed: {status_line.strip()}"
             elif len(response) > 0:
-                # Check if we got binary WebSocket frames (indicates successful handshake)
-                if response.startswith("b'") and ("\\x81" in response or "\\x82" in response):
-                    return True, f"✓ WebSocket handshake successful (binary frames received) ({response_time:.3f}s)", True
+                # A reply that opens with a text or binary frame header means the handshake went through
+                if result.stdout[:1] in (b"\x81", b"\x82"):
+                    return True, f"✓ WebSocket handshake successful (binary frames received) ({response_time:.3f}s)"
                 else:
-                    return False, f"✗ Unexpected response format: {response[:50]}...", True
+                    return False, f"✗ Unexpected response format: {response[:50]}..."
             else:
-                return False, f"✗ No HTTP response received", True
+                return False, f"✗ No HTTP response received"
+        elif result.returncode == 124:  # timeout
+            return False, f"✗ Handshake timeout ({timeout}s)"
         else:
             error_msg = stderr_text.strip() if stderr_text else "Connection failed"
-            return False, f"✗ Connection failed: {error_msg[:100]}", True
+            return False, f"✗ Connection failed: {error_msg[:100]}"
             
-    except subprocess.TimeoutExpired:
-        return False, f"✗ Handshake timeout ({timeout}s)", True
     except Exception as e:
-        return False, f"✗ Handshake error: {str(e)}", True
+        return False, f"✗ Handshake error: {str(e)}"
 
 async def test_websocket(uri, timeout=15):
     """
@@ -469,48 +627,66 @@ async def test_websocket(uri, timeout=15):
         tuple: (success: bool, message: str, response_time: float)
     """
     start_time = time.time()
+    connect_time = None
     
     try:
-        # Create SSL context that's more permissive for testing
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        
-        # Attempt to connect with timeout
-        async with websockets.connect(
-            uri, 
-            ssl=ssl_context,
-            ping_timeout=timeout,
-            ping_interval=None,  # Disable ping/pong for basic testing
-            close_timeout=5
-        ) as websocket:
+        # Connect to the address cached by resolve() when there is one; the URI's
+        # hostname is still used for the Host header and for SNI
+        connect_kwargs = {}
+        parsed = _parse_ws_uri(uri)
+        if parsed and parsed[0] in _DNS_CACHE:
+            hostname, _, _, use_ssl = parsed
+            connect_kwargs["host"] = _DNS_CACHE[hostname]
+            if use_ssl:
+                connect_kwargs["server_hostname"] = hostname
+        
+        async def exchange():
+            nonlocal connect_time
             
-            response_time = time.time() - start_time
-            
-            # Try to send a test message and receive response
-            try:
-                test_message = "test connection"
-                await asyncio.wait_for(websocket.send(test_message), timeout=5)
+            async with websockets.connect(
+                uri,
+                ssl=_SSL_CTX,
+                ping_timeout=timeout,
+                ping_interval=None,  # Disable ping/pong for basic testing
+                close_timeout=5,
+                **connect_kwargs
+            ) as websocket:
                 
-                # For echo servers, try to receive the echo
-                if any(keyword in uri.lower() for keyword in ["echo", "postman", "vi-server", "ifelse"]):
-                    response = await asyncio.wait_for(websocket.recv(), timeout=5)
-                    return True, f"✓ Connected successfully (echo received: {response[:50]}...)", response_time
-                else:
-                    # For data streams, just check if we receive any data
+                connect_time = time.time() - start_time
+                
+                # Try to send a test message and receive response
+                try:
+                    test_message = "test connection"
+                    # Start the send and go straight to receiving rather than waiting for it to drain
+                    send_task = asyncio.ensure_future(websocket.send(test_message))
                     try:
-                        response = await asyncio.wait_for(websocket.recv(), timeout=3)
-                        return True, f"✓ Connected successfully (data received: {len(str(response))} chars)", response_time
-                    except asyncio.TimeoutError:
-                        # No immediate response is OK for some endpoints
-                        return True, "✓ Connected successfully (connection established)", response_time
+                        # For echo servers, try to receive the echo
+                        if any(keyword in uri.lower() for keyword in ["echo", "postman", "vi-server", "ifelse"]):
+                            response = await asyncio.wait_for(websocket.recv(), timeout=5)
+                            return True, f"✓ Connected successfully (echo received: {response[:50]}...)", connect_time
+                        else:
+                            # For data streams, just check if we receive any data
+                            try:
+                                response = await asyncio.wait_for(websocket.recv(), timeout=3)
+                                return True, f"✓ Connected successfully (data received: {len(str(response))} chars)", connect_time
+                            except asyncio.TimeoutError:
+                                # No immediate response is OK for some endpoints
+                                return True, "✓ Connected successfully (connection established)", connect_time
+                    finally:
+                        await send_task
                         
-            except asyncio.TimeoutError:
-                return True, "✓ Connected successfully (no echo response - may be data stream)", response_time
-            except Exception as msg_error:
-                return True, f"✓ Connected but messaging failed: {str(msg_error)}", response_time
+                except asyncio.TimeoutError:
+                    return True, "✓ Connected successfully (no echo response - may be data stream)", connect_time
+                except Exception as msg_error:
+                    return True, f"✓ Connected but messaging failed: {str(msg_error)}", connect_time
+        
+        # A single deadline covers connect, send/receive and close
+        return await asyncio.wait_for(exchange(), timeout)
                 
     except asyncio.TimeoutError:
+        if connect_time is not None:
+            # The deadline ran out after the handshake, e.g. while closing
+            return True, "✓ Connected successfully (timed out before closing)", connect_time
         response_time = time.time() - start_time
         return False, f"✗ Connection timeout after {timeout} seconds", response_time
         
@@ -555,7 +731,7 @@ async def test_websocket(uri, timeout=15):
         response_time = time.time() - start_time
         return False, f"✗ Unexpected error: {type(e).__name__}: {str(e)}", response_time
 
-def test_with_websocat(uri, timeout=10):
+async def test_with_websocat(uri, timeout=10):
     """
     Test WebSocket endpoint using websocat (proper WebSocket client)
     
@@ -564,30 +740,23 @@ def test_with_websocat(uri, timeout=10):
         timeout (int): Timeout in seconds
         
     Returns:
-        tuple: (success: bool, message: str, tool_available: bool)
+        tuple: (success: bool, message: str)
     """
-    if not shutil.which("websocat"):
-        return False, "✗ websocat not installed", False
-    
     try:
         start_time = time.time()
         
-        # websocat with timeout and connection test
-        timeout_cmd = get_timeout_command()
-        if timeout_cmd:
-            cmd = [timeout_cmd, str(timeout), "websocat", "-t", uri, "-E"]
-        else:
-            cmd = ["websocat", "-t", uri, "-E"]
+        # websocat connection test, wrapped in the system timeout command
+        cmd = ["websocat", "-t", uri, "-E"]
         
         # Test with a simple message
         test_message = "test connection\n"
         
-        result = subprocess.run(
+        result = await run_with_timeout(
             cmd,
+            timeout,
             input=test_message,
-            capture_output=True,
             text=True,
-            timeout=timeout + 2
+            use_timeout_cmd=True
         )
         
         response_time = time.time() - start_time
@@ -595,83 +764,66 @@ def test_with_websocat(uri, timeout=10):
         if result.returncode == 0:
             output = result.stdout.strip()
             if output:
-                return True, f"✓ WebSocket connected, echo received: {output[:50]}... ({response_time:.3f}s)", True
+                return True, f"✓ WebSocket connected, echo received: {output[:50]}... ({response_time:.3f}s)"
             else:
-                return True, f"✓ WebSocket connected successfully ({response_time:.3f}s)", True
+                return True, f"✓ WebSocket connected successfully ({response_time:.3f}s)"
         elif result.returncode == 124:  # timeout
-            return False, f"✗ Connection timeout ({timeout}s)", True
+            return False, f"✗ Connection timeout ({timeout}s)"
         else:
             error_msg = result.stderr.strip() or "Connection failed"
-            return False, f"✗ Failed: {error_msg[:100]}", True
+            return False, f"✗ Failed: {error_msg[:100]}"
             
-    except subprocess.TimeoutExpired:
-        return False, f"✗ Process timeout ({timeout}s)", True
     except Exception as e:
-        return False, f"✗ Error running websocat: {str(e)}", True
+        return False, f"✗ Error running websocat: {str(e)}"
 
-def test_with_external_tool(uri, tool_name, timeout=10):
+async def test_with_wscat(uri, timeout=10):
     """
-    Test WebSocket endpoint using external command-line tools
+    Test WebSocket endpoint using wscat
     
     Args:
         uri (str): WebSocket URI to test
-        tool_name (str): Tool to use ('wscat', 'websocat', 'socat-http', 'socat-websocket')
         timeout (int): Timeout in seconds
         
     Returns:
-        tuple: (success: bool, message: str, tool_available: bool)
+        tuple: (success: bool, message: str)
     """
-    
-    # Handle different tools
-    if tool_name == "websocat":
-        return test_with_websocat(uri, timeout)
-    elif tool_name == "socat-http":
-        return test_http_with_socat(uri, timeout)
-    elif tool_name == "socat-websocket":
-        return test_websocket_handshake_with_socat(uri, timeout)
-    
-    # Check if tool is available for other tools
-    tool_path = shutil.which(tool_name)
-    if not tool_path:
-        return False, f"✗ {tool_name} not installed", False
-    
     try:
         start_time = time.time()
         
-        if tool_name == "wscat":
-            # wscat -c URL (connect and exit quickly)
-            cmd = ["wscat", "-c", uri, "-w", "2"]  # 2 second wait
-        elif tool_name == "websocat":
-            # This case is handled by test_with_websocat function above
-            return test_with_websocat(uri, timeout)
-        else:
-            return False, f"✗ Unsupported tool: {tool_name}", True
-            
+        # wscat -c URL (connect and exit quickly)
+        cmd = ["wscat", "-c", uri, "-w", "2"]  # 2 second wait
+        
         # Run the command
-        result = subprocess.run(
+        result = await run_with_timeout(
             cmd, 
-            capture_output=True, 
-            text=True, 
-            timeout=timeout + 2,
-            input="test\n"  # Send test message and newline
+            timeout,
+            input="test\n",  # Send test message and newline
+            text=True,
+            use_timeout_cmd=True
         )
         
         response_time = time.time() - start_time
         
         if result.returncode == 0:
-            return True, f"✓ WebSocket connection successful ({response_time:.3f}s)", True
+            return True, f"✓ WebSocket connection successful ({response_time:.3f}s)"
         elif result.returncode == 124:  # timeout command exit code
-            return False, f"✗ Connection timeout ({timeout}s)", True
+            return False, f"✗ Connection timeout ({timeout}s)"
         else:
             error_msg = result.stderr.strip() or result.stdout.strip() or "Connection failed"
-            return False, f"✗ Failed: {error_msg[:100]}", True
+            return False, f"✗ Failed: {error_msg[:100]}"
             
-    except subprocess.TimeoutExpired:
-        return False, f"✗ Process timeout ({timeout}s)", True
     except FileNotFoundError:
-        return False, f"✗ {tool_name} command not found", False
+        return False, "✗ wscat command not found"
     except Exception as e:
-        return False, f"✗ Error running {tool_name}: {str(e)}", True
+        return False, f"✗ Error running wscat: {str(e)}"
+
+# External tool name -> test coroutine taking (uri, timeout); only tools in _AVAILABLE_TOOLS are run
+_TOOL_DISPATCH = {
+    "wscat": test_with_wscat,
+    "websocat": test_with_websocat,
+    "socat-http": test_http_with_socat,
+    "socat-websocket": test_websocket_handshake_with_socat
+}
 
 async def test_all_endpoints():
     """Test all WebSocket endpoints using multiple methods"""
@@ -682,18 +834,8 @@ async def test_all_endpoints():
     print("=" * 80)
     print()
     
-    # Check which external tools are available
-    available_tools = []
-    tool_configs = [
-        ("wscat", "wscat"),
-        ("websocat", "websocat"),
-        ("socat-http", "socat"),
-        ("socat-websocket", "socat")
-    ]
-    
-    for tool_name, binary_name in tool_configs:
-        if shutil.which(binary_name):
-            available_tools.append(tool_name)
+    # External tools found on PATH at import time
+    available_tools = _AVAILABLE_TOOLS
     
     if available_tools:
         print(f"External tools available: {', '.join(available_tools)}")
@@ -715,64 +857,98 @@ async def test_all_endpoints():
     if "websocat" in available_tools or "socat-http" in available_tools:
         print()  # Add spacing if we printed notes
     
-    results = []
-    
+    # Resolve each endpoint hostname once before any probes run; URIs that fail to
+    # parse are skipped here and reported by their own endpoint tests
+    hostnames = set()
     for uri in ENDPOINTS:
-        print(f"Testing {uri}")
-        print("-" * 50)
+        try:
+            parsed = _parse_ws_uri(uri)
+        except ValueError:
+            continue
+        if parsed and parsed[0]:
+            hostnames.add(parsed[0])
+    await asyncio.gather(*[resolve(hostname) for hostname in hostnames])
+    
+    async def test_one(uri):
+        """Run every test against one URI, buffering output so it prints as one block"""
+        results = []
+        lines = []
+        
+        lines.append(f"Testing {uri}")
+        lines.append("-" * 50)
         
         # Test with Python websockets
         success, message, response_time = await test_websocket(uri)
+        python_success = success
         results.append(('Python websockets', uri, success, message, response_time))
-        print(f"[Python websockets] {message} ({response_time:.3f}s)")
+        lines.append(f"[Python websockets] {message} ({response_time:.3f}s)")
         
         # Test with external tools
         for tool in available_tools:
-            success, message, tool_available = test_with_external_tool(uri, tool)
-            if tool_available:
-                results.append((tool, uri, success, message, 0))
-                print(f"[{tool}] {message}")
-                
-                # If socat failed but Python succeeded, run detailed diagnosis
-                if not success and (tool == "socat-http" or tool == "socat-websocket"):
-                    # Check if Python websockets succeeded for this URI
-                    python_success = any(r[2] for r in results if r[0] == 'Python websockets' and r[1] == uri)
-                    if python_success:
-                        print(f"    🔍 Diagnosing socat failure (Python websockets worked)...")
-                        diagnosis = diagnose_socat_failure(uri)
-                        if diagnosis.get("available", False):
-                            print(f"    📋 DIAGNOSIS: {diagnosis['diagnosis']}")
-                            
-                            # Show key test results
-                            tests = diagnosis.get("tests", {})
-                            if "ssl_strict" in tests and not tests["ssl_strict"]["success"] and tests.get("ssl_relaxed", {}).get("success", False):
-                                print(f"    ├── SSL certificate issue detected")
-                            if "http_request" in tests:
-                                status = tests["http_request"].get("status_code")
-                                if status:
-                                    print(f"    ├── HTTP status code: {status}")
-                            if "websocket_handshake" in tests and not tests["websocket_handshake"]["success"]:
-                                print(f"    └── WebSocket handshake failed")
-                        print()
-        
-        print()
+            success, message = await _TOOL_DISPATCH[tool](uri)
+            results.append((tool, uri, success, message, 0))
+            lines.append(f"[{tool}] {message}")
+            
+            # If socat failed but Python succeeded, run detailed diagnosis
+            if not success and (tool == "socat-http" or tool == "socat-websocket"):
+                if python_success:
+                    lines.append(f"    🔍 Diagnosing socat failure (Python websockets worked)...")
+                    diagnosis = await diagnose_socat_failure(uri, log=lines.append)
+                    if diagnosis.get("available", False):
+                        lines.append(f"    📋 DIAGNOSIS: {diagnosis['diagnosis']}")
+                        
+                        # Show key test results
+                        tests = diagnosis.get("tests", {})
+                        if "ssl_strict" in tests and not tests["ssl_strict"]["success"] and tests.get("ssl_relaxed", {}).get("success", False):
+                            lines.append(f"    ├── SSL certificate issue detected")
+                        if "http_request" in tests:
+                            status = tests["http_request"].get("status_code")
+                            if status:
+                                lines.append(f"    ├── HTTP status code: {status}")
+                        if "websocket_handshake" in tests and not tests["websocket_handshake"]["success"]:
+                            lines.append(f"    └── WebSocket handshake failed")
+                    lines.append("")
+        
+        lines.append("")
+        return results, lines
+    
+    # Test endpoints concurrently, at most MAX_CONCURRENT_ENDPOINTS at a time;
+    # output is printed per endpoint in ENDPOINTS order
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_ENDPOINTS)
+    
+    async def guarded(uri):
+        async with semaphore:
+            return await test_one(uri)
+    
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(guarded(uri)) for uri in ENDPOINTS]
+    
+    results = []
+    for task in tasks:
+        endpoint_results, lines = task.result()
+        results.extend(endpoint_results)
+        for line in lines:
+            print(line)
     
     # Summary
     print("=" * 80)
     print("SUMMARY")
     print("=" * 80)
     
-    # Group results by tool
-    by_tool = {}
+    # Group results by tool in a single pass; every tool's entry exists up front
+    by_tool = {
+        tool: {'total': 0, 'success': 0, 'results': []}
+        for tool in ('Python websockets',) + available_tools
+    }
     for tool, uri, success, message, response_time in results:
-        if tool not in by_tool:
-            by_tool[tool] = {'total': 0, 'success': 0, 'results': []}
         by_tool[tool]['total'] += 1
         if success:
             by_tool[tool]['success'] += 1
         by_tool[tool]['results'].append((uri, success, message))
     
     for tool, data in by_tool.items():
+        if not data['total']:
+            continue
         success_rate = (data['success'] / data['total']) * 100
         print(f"\n{tool}:")
         print(f"  Success rate: {data['success']}/{data['total']} ({success_rate:.1f}%)")